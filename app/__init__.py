@@ -16,8 +16,7 @@ Configuration:
 - MAIL_USE_TLS: Boolean to enable TLS for the mail server.
 - MAIL_USERNAME: Username for the mail server.
 - MAIL_PASSWORD: Password for the mail server.
-- SESSION_TYPE: Type of session management.
-- SECRET_KEY: Secret key used for Flask session management.
+- SECRET_KEY: Secret key used for signing tokens.
 
 Usage:
 Call `create_app(config_name)` 
@@ -29,33 +28,15 @@ Example:
 
 import os
 from flask import Flask, jsonify
-from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
-from flask_mail import Mail
-from flask_migrate import Migrate
-from flask_cors import CORS
-from flasgger import Swagger
-from dotenv import load_dotenv
-from flask_jwt_extended import JWTManager
-from flask_swagger_ui import get_swaggerui_blueprint
-from flask_session import Session
+# Importing config loads the .env file, once per process
 from app import config
-from .extensions import db
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Initialize extensions
-bcrypt = Bcrypt()
-jwt = JWTManager()
-mail = Mail()
-sess = Session()
-migrate = Migrate()
-swagger = Swagger()
-migrate = Migrate()
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Static JSON bodies, encoded once instead of on every request
+WELCOME_BODY = b'{"message": "Welcome to TaskBite API"}'
+INVALID_REQUEST_BODY = b'{"errors": ["Invalid request."]}'
+
 def create_app(config_name):
     """
     Creates a Flask application instance with the specified configuration.
@@ -73,69 +54,75 @@ def create_app(config_name):
     Example:
         >>> app = create_app('development')
     """
+    # Extensions are imported here rather than at module level so that
+    # importing the package (CLI, config, tests) doesn't pay their import cost.
+    import redis
+    from flask_cors import CORS
+    from flasgger import Swagger
+    from .extensions import db, bcrypt, jwt, mail, migrate, limiter
+    from .json_provider import OrjsonProvider
 
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
-    # Load additional config
-    app_config = {
-        'development': config.DevelopmentConfig,
-        'testing': config.TestingConfig,
-        'production': config.ProductionConfig,
-    }
-
-    if config_name not in app_config:
+    if config_name not in config.app_config:
         raise KeyError(f"Configuration '{config_name}' is not a valid configuration name.")
 
-    app.config.from_object(app_config[config_name])
-
-    # Load environment variables
-    # app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('SQLALCHEMY_DATABASE_URI')
-    # app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
-    # app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER')
-    # app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT'))
-    # app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS') == 'True'
-    # app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-    # app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-    # app.config['SESSION_TYPE'] = 'filesystem'
-    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
-
-    if __name__ == "__main__":
-        config_name = 'development'
+    # Environment variables are read once, when app.config is imported,
+    # so there is no need to look them up again on every factory call.
+    app.config.from_object(config.app_config[config_name])
+
     CORS(app)
 
     # Initialize extensions
-    db.app = app
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
     mail.init_app(app)
-    sess.init_app(app)
+    limiter.init_app(app)
     migrate.init_app(app, db)
-    swagger.init_app(app)
+    # The client connects lazily, on its first command, and its connection
+    # pool is shared by every request (and thread) served by this app
+    app.extensions['redis'] = redis.Redis.from_url(
+        app.config['REDIS_URL'],
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+    Swagger(app)
 
     #Register blueprints only once
     from .auth.routes import auth
-    from app.admin.routes import users_blueprint
+    from .admin.routes import users_blueprint
+    from .calendar.routes import calendar
+    from .tasks.routes import tasks
+
+    from .admin.commands import admin_cli
 
-    app.register_blueprint(users_blueprint, url_prefix='/api/admin/user')
-    app.register_blueprint(auth)
+    for blueprint, url_prefix in (
+        (auth, '/api/auth'),
+        (calendar, '/api/calendar'),
+        (users_blueprint, '/api/admin/user'),
+        (tasks, '/api/tasks'),
+    ):
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
+    app.cli.add_command(admin_cli)
 
     #Index Route
     @app.route('/')
     def root():
         """Returns a welcome message."""
-        return {'message': 'Welcome to TaskBite API'}, 200
+        return app.response_class(WELCOME_BODY, status=200, mimetype='application/json')
 
     # Error handling
     @app.errorhandler(422)
     @app.errorhandler(400)
     def handle_validation_error(exc):
         """Handles 422 and 400 errors."""
-        if exc is None:
-            return jsonify({"errors": ["Invalid request."]})
-        if exc.data is None:
-            return jsonify({"errors": ["Invalid request."]})
-        messages = exc.data.get("messages", ["Invalid request."])
-        return jsonify({"errors": messages})
+        # Only webargs-style errors carry .data; werkzeug's BadRequest doesn't
+        data = getattr(exc, 'data', None)
+        if data is None:
+            return app.response_class(INVALID_REQUEST_BODY, status=exc.code, mimetype='application/json')
+        messages = data.get("messages", ["Invalid request."])
+        return jsonify({"errors": messages}), exc.code
 
     return app
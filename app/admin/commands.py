@@ -0,0 +1,53 @@
+"""
+This module defines the `flask admin` command group, used to provision
+admin access from the command line.
+
+The admin API routes only accept users whose account is linked to an
+active Admin row, and no route can create one, so the first admin has to
+be granted here.
+
+Usage:
+    flask admin grant user@example.com
+"""
+import secrets
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+from app import models, extensions
+from app.admin.models import Admin
+
+db = extensions.db
+User = models.User
+
+admin_cli = AppGroup('admin', help='Manage admin access.')
+
+@admin_cli.command('grant')
+@click.argument('email')
+def grant_admin(email):
+    """
+    Grants admin access to the registered user with EMAIL.
+
+    The user's Admin row is created if it doesn't exist yet, and is
+    otherwise re-activated.
+
+    Args:
+        email (str): The email of an existing user account.
+
+    Returns:
+        None
+    """
+    user = db.session.execute(select(User).where(User.email == email)).scalar_one_or_none()
+    if user is None:
+        raise click.ClickException(f"No user registered with email {email}")
+
+    admin = db.session.execute(select(Admin).where(Admin.user_id == user.id)).scalar_one_or_none()
+    if admin is None:
+        admin = Admin(email=user.email, user_id=user.id)
+        # The API authenticates admins through their user account, so the
+        # Admin row's own password is never used; give it one nobody knows
+        admin.set_password(secrets.token_urlsafe(32))
+        db.session.add(admin)
+    admin.is_admin = True
+    admin.is_active = True
+    db.session.commit()
+    click.echo(f"Granted admin access to {email}")
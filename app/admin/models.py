@@ -1,9 +1,6 @@
 # models.py
-from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask_login import UserMixin
-
-db = SQLAlchemy()
+from app.extensions import db
 
 class Role(db.Model):
     """
@@ -27,12 +24,15 @@ class Permission(db.Model):
     def __repr__(self):
         return f"Permission('{self.name}')"
 
-class Admin(UserMixin, db.Model):
+class Admin(db.Model):
     """
     Model for admins.
     """
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
+    # The API user account granted admin rights; users can change their own
+    # email, so access is tied to the account id rather than the address
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), unique=True, nullable=True)
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
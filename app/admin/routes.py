@@ -1,37 +1,72 @@
 """
-This module initializes a Flask application with user-related routes.
+This module defines the admin blueprint with user-related routes.
 It supports retrieving all users and deleting a user by their ID.
-Swagger is used for API documentation, and Flask-Session is configured
-to manage user sessions.
+Both routes are restricted to users with an active Admin account.
+The blueprint is registered by `create_app`, which also sets up Swagger.
 """
 
-from flask import Flask, jsonify, Blueprint
-from flasgger import Swagger
-from flask_session import Session
-from app import models, schemas, extensions
-
-app = Flask(__name__)
-swagger = Swagger(app)
-
-# Initialize Flask-Session
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SECRET_KEY'] = 'supersecretkey'
-Session(app)
+from functools import wraps
+from flask import jsonify, Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select, delete
+from app import models, extensions
+from app.admin.models import Admin
 
 db = extensions.db
 User = models.User
-UserSchema = schemas.UserSchema
 
 users_blueprint = Blueprint('users', __name__)
 
-user_schema = UserSchema()
-users_schema = UserSchema(many=True)
+# Page size used when the client doesn't ask for one, and the most it may ask for
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+def admin_required(fn):
+    """
+    Restricts a route to users who hold an active admin account.
+
+    The caller must present a valid JWT, and the user it identifies must
+    be linked (Admin.user_id) to an Admin row that is both active and
+    flagged is_admin. The check is made against the database on every
+    request, so revoking an admin takes effect immediately.
+
+    Args:
+        fn (callable): The view function to protect.
+
+    Returns:
+        callable: The wrapped view, returning 403 for non-admins.
+    """
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        is_admin = db.session.execute(
+            select(Admin.id)
+            .where(Admin.user_id == get_jwt_identity(), Admin.is_admin, Admin.is_active)
+        ).first()
+        if is_admin is None:
+            return jsonify({"error": "Admin access required"}), 403
+        return fn(*args, **kwargs)
+    return wrapper
 
 @users_blueprint.route('/users', methods=['GET'])
+@admin_required
 def get_users():
     """
-    Get all users
+    Get all users, one page at a time
     ---
+    parameters:
+      - name: page
+        in: query
+        type: integer
+        required: false
+        default: 1
+        description: The page number, starting at 1
+      - name: per_page
+        in: query
+        type: integer
+        required: false
+        default: 20
+        description: The number of users per page (at most 100)
     responses:
       200:
         description: A list of users
@@ -39,12 +74,28 @@ def get_users():
           type: array
           items:
             $ref: '#/definitions/User'
+      401:
+        description: Unauthorized
+      403:
+        description: Admin access required
     """
-    users = User.query.all()
-    users_dict_list = users_schema.dump(users)  # Use Marshmallow schema to serialize
-    return jsonify(users_dict_list), 200
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', DEFAULT_PER_PAGE, type=int), 1), MAX_PER_PAGE)
+
+    # Select only the serialized columns instead of hydrating full User objects
+    users = db.session.execute(
+        select(User.id, User.username, User.email, User.name,
+               User.created_at, User.updated_at, User.email_verified)
+        .order_by(User.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).mappings().all()
+    # The selected columns are exactly the UserSchema dump fields, so each row
+    # mapping becomes the response dict as-is; no per-row schema dispatch
+    return jsonify([dict(user) for user in users]), 200
 
-@users_blueprint.route('/delete/<int:user_id>', methods=['DELETE'])
+@users_blueprint.route('/delete/<string:user_id>', methods=['DELETE'])
+@admin_required
 def delete_user(user_id):
     """
     Delete user
@@ -52,22 +103,24 @@ def delete_user(user_id):
     parameters:
       - name: user_id
         in: path
-        type: integer
+        type: string
         required: true
         description: The user ID
     responses:
       200:
         description: User deleted successfully
+      401:
+        description: Unauthorized
+      403:
+        description: Admin access required
       404:
         description: User not found
     """
-    user = User.query.get(user_id)
-    if not user:
+    deleted = db.session.execute(delete(User).where(User.id == user_id)).rowcount
+    db.session.commit()
+
+    if not deleted:
         return jsonify({"error": "User not found"}), 404
 
-    db.session.delete(user)
-    db.session.commit()
     return jsonify({"message": "User deleted successfully"}), 200
 
-if __name__ == '__main__':
-    app.run(debug=True)
@@ -7,7 +7,7 @@ and updating and deleting user accounts.
 The API uses JSON Web Tokens (JWT) for authentication and authorization.
 
 Usage:
-    To run the API, execute this module as a script.
+    The `auth` blueprint is registered by `create_app`.
     To use the API, send HTTP requests to the various endpoints.
 
 Endpoints:
@@ -16,47 +16,121 @@ Endpoints:
     /logout: Log out a user
     /forgot-password: Send a password reset email to a user
     /reset-password: Reset a user's password
-    /update/<int:user_id>: Update a user's account information
+    /update/<string:user_id>: Update a user's account information
     /delete: Delete a user account
 """
-import os
+import queue
 import re
-from flask import Flask, request, jsonify, Blueprint
-from flasgger import Swagger
+import time
+import redis
+from functools import lru_cache
+from threading import Lock, Thread
+from flask import request, jsonify, Blueprint, current_app, abort
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from flask_jwt_extended import create_access_token
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask_mail import Mail, Message
-from flask_bcrypt import Bcrypt
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask_session import Session
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_mail import Message
+from sqlalchemy import select, update, delete, bindparam, or_
+from sqlalchemy.exc import IntegrityError
 
 #Import from package 'app'
-from app import models, extensions, schemas
+from app import models, extensions
 
-#Intialize Flask app
-app = Flask(__name__)
-swagger = Swagger(app)
-bcrypt = Bcrypt(app)
-limiter = Limiter(app=app, key_func=get_remote_address)
-
-# Initialize Flask-Session
-app.config['SESSION_TYPE'] = 'filesystem'
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
-serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'])
-Session(app)
-
-#Intialize database and schema
+#Intialize database and extensions
 db = extensions.db
+bcrypt = extensions.bcrypt
+jwt = extensions.jwt
+mail = extensions.mail
+limiter = extensions.limiter
 User = models.User
-UserSchema = schemas.UserSchema
 
 #Initialize blueprint
 auth = Blueprint('auth', __name__, url_prefix='/api/auth')
 
-user_schema = UserSchema()
-users_schema = UserSchema(many=True)
+# Prebuilt user lookup; only the bound email changes between requests,
+# so SQLAlchemy's compiled cache is hit without rebuilding the query
+_USER_BY_EMAIL = select(User).where(User.email == bindparam('email'))
+
+# Outgoing mail, sent by a single background worker over a reused SMTP connection
+_mail_queue = queue.Queue()
+_mail_worker = None
+_mail_worker_lock = Lock()
+
+# Seconds the mail worker keeps an idle SMTP connection open before closing it
+MAIL_IDLE_TIMEOUT = 30
+
+# Redis key under which a revoked token's jti is stored
+_BLOCKLIST_KEY = 'jwt:blocklist:{}'
+
+LOGOUT_BODY = b'{"message": "Logout successful"}'
+AUTH_UNAVAILABLE_BODY = b'{"message": "Authentication service unavailable"}'
+
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_.-]+\Z')
+
+# Password reset email body, filled in per message with format_map
+_RESET_EMAIL_TMPL = "Your password reset token is: {token}"
+
+@jwt.token_in_blocklist_loader
+def token_in_blocklist(jwt_header, jwt_payload):
+    """
+    Tells Flask-JWT-Extended whether a token has been revoked.
+
+    Args:
+        jwt_header (dict): The token's header.
+        jwt_payload (dict): The token's claims.
+
+    Returns:
+        bool: True if the token's jti was revoked by a logout.
+
+    Raises:
+        HTTPException: A 503 if Redis can't be reached. The check fails
+        closed, so a revoked token is never accepted during an outage.
+    """
+    key = _BLOCKLIST_KEY.format(jwt_payload['jti'])
+    try:
+        return current_app.extensions['redis'].exists(key) == 1
+    except redis.RedisError:
+        current_app.logger.error("Token blocklist unavailable", exc_info=True)
+        abort(current_app.response_class(
+            AUTH_UNAVAILABLE_BODY, status=503, mimetype='application/json'
+        ))
+
+@lru_cache(maxsize=4)
+def _serializer_for(secret_key):
+    """
+    Builds the reset token serializer for a secret key, once per process.
+
+    Args:
+        secret_key (str): The key used to sign tokens.
+
+    Returns:
+        URLSafeTimedSerializer: The serializer.
+    """
+    return URLSafeTimedSerializer(secret_key)
+
+def get_serializer():
+    """
+    Returns the serializer used to sign password reset tokens.
+
+    Returns:
+        URLSafeTimedSerializer: A serializer keyed with the app's SECRET_KEY.
+    """
+    return _serializer_for(current_app.config['SECRET_KEY'])
+
+@lru_cache(maxsize=None)
+def _dummy_password_hash():
+    """
+    Returns a bcrypt hash that no submitted password is expected to match.
+
+    It is computed on first use, so that it picks up the app's
+    BCRYPT_LOG_ROUNDS, and then reused for the life of the process.
+
+    Returns:
+        bytes: The bcrypt hash.
+    """
+    return bcrypt.generate_password_hash('x' * 12)
 
 def generate_password_reset_token(user_id):
     """
@@ -68,12 +142,68 @@ def generate_password_reset_token(user_id):
     Returns:
         str: The password reset token.
     """
-    return serializer.dumps(user_id, salt='password-reset-salt')
+    return get_serializer().dumps(user_id, salt='password-reset-salt')
+
+def _drain_mail_queue():
+    """
+    Sends queued messages for as long as the process runs.
+
+    An SMTP connection is opened when a message arrives and reused for every
+    message that follows, until the queue has been idle for
+    MAIL_IDLE_TIMEOUT seconds or a message for a different app comes in.
+
+    Returns:
+        None
+    """
+    item = None
+    while True:
+        app, msg = item or _mail_queue.get()
+        item = None
+        with app.app_context():
+            try:
+                with mail.connect() as conn:
+                    while True:
+                        conn.send(msg)
+                        try:
+                            item = _mail_queue.get(timeout=MAIL_IDLE_TIMEOUT)
+                        except queue.Empty:
+                            break
+                        if item[0] is not app:
+                            break
+                        _, msg = item
+                        item = None
+            except Exception:
+                app.logger.exception("Failed to send email to %s", msg.recipients)
+
+def send_async_email(app, msg):
+    """
+    Queues an email to be sent inside the given application's context.
+
+    The message is sent by a background worker, so the SMTP round-trip
+    doesn't block the request that triggered it. The worker is started
+    on first use.
+
+    Args:
+        app (Flask): The application whose mail configuration to use.
+        msg (Message): The message to send.
+
+    Returns:
+        None
+    """
+    global _mail_worker
+    _mail_queue.put((app, msg))
+    with _mail_worker_lock:
+        if _mail_worker is None or not _mail_worker.is_alive():
+            _mail_worker = Thread(target=_drain_mail_queue, daemon=True)
+            _mail_worker.start()
 
 def send_password_reset_email(user, token):
     """
     Sends a password reset email to the given user.
 
+    The message is queued for the background mail worker; this function
+    returns without waiting for the SMTP server.
+
     Args:
         user (User): The user to send the email to.
         token (str): The password reset token.
@@ -81,12 +211,9 @@ def send_password_reset_email(user, token):
     Returns:
         None
     """
-    # Implement your email sending logic here
-    # For example, using Flask-Mail:
-    mail = Mail(app)
-    msg = Message("Password Reset", sender="your-email@example.com", recipients=[user.email])
-    msg.body = f"Your password reset token is: {token}"
-    mail.send(msg)
+    msg = Message("Password Reset", recipients=[user.email])
+    msg.body = _RESET_EMAIL_TMPL.format_map({'token': token})
+    send_async_email(current_app._get_current_object(), msg)
 
 def validate_email(email):
     """
@@ -98,8 +225,7 @@ def validate_email(email):
     Returns:
         bool: True if the email is valid, False otherwise.
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 def validate_username(username):
     """
@@ -111,8 +237,7 @@ def validate_username(username):
     Returns:
         bool: True if the username is valid, False otherwise.
     """
-    pattern = r'^[a-zA-Z0-9_.-]+$'
-    return bool(re.match(pattern, username))
+    return _USERNAME_RE.match(username) is not None
 
 def validate_password(password):
     """
@@ -171,32 +296,37 @@ def register():
     if not all([username, name, password, email]):
         return jsonify({'message': 'Missing required fields'}), 400
 
-    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+    if not validate_email(email):
         return jsonify({'message': 'Invalid email address'}), 400
 
-    if not re.match(r'^[a-zA-Z0-9_.-]+$', username):
+    if not validate_username(username):
         return jsonify({'message': 'Invalid username'}), 400
 
     if len(password) < 8:
         return jsonify({'message': 'Password must be at least 8 characters'}), 400
 
+    user = User(username=username, name=name, email=email)
     try:
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        user.set_password(password)
     except Exception as e:
         return jsonify({'message': 'Failed to hash password'}), 400
 
-    user = User(username=username, name=name, password=hashed_password, email=email)
+    # The unique constraints on username and email do the duplicate check,
+    # so registration is a single INSERT with no race between check and write
     try:
         db.session.add(user)
         db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Username or email already taken'}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({'message': 'Failed to create user'}), 400
 
     return jsonify({'message': 'User registered successfully'}), 201
 
 @auth.route('/login', methods=['POST'])
 @limiter.limit("10/minute")
-@jwt_required()
 def login():
 
     """
@@ -235,12 +365,18 @@ def login():
     if email is None or password is None:
         return jsonify({'message': 'Missing required fields'}), 400
 
-    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+    if not validate_email(email):
         return jsonify({'message': 'Invalid email address'}), 400
 
-    user = User.query.filter_by(email=email).first()
+    user = db.session.execute(_USER_BY_EMAIL, {'email': email}).scalar_one_or_none()
+
+    if user is None:
+        # Pay the same bcrypt cost as a wrong password, so the response
+        # time doesn't reveal whether the email is registered
+        bcrypt.check_password_hash(_dummy_password_hash(), password)
+        return jsonify({'message': 'Invalid credentials'}), 401
 
-    if user is None or not bcrypt.check_password_hash(user.password, password):
+    if not user.check_password(password):
         return jsonify({'message': 'Invalid credentials'}), 401
 
     access_token = create_access_token(identity=user.id)
@@ -255,9 +391,19 @@ def logout():
     responses:
       200:
         description: Logout successful
+      503:
+        description: The token could not be revoked
     """
+    # Revoke the token until it would have expired anyway; Redis then drops the key
+    claims = get_jwt()
+    ttl = max(1, claims['exp'] - int(time.time()))
+    try:
+        current_app.extensions['redis'].setex(_BLOCKLIST_KEY.format(claims['jti']), ttl, 1)
+    except redis.RedisError:
+        current_app.logger.error("Failed to revoke token", exc_info=True)
+        return current_app.response_class(AUTH_UNAVAILABLE_BODY, status=503, mimetype='application/json')
 
-    return jsonify({"message": "Logout successful"}), 200
+    return current_app.response_class(LOGOUT_BODY, status=200, mimetype='application/json')
 
 @auth.route('/forgot-password', methods=['POST'])
 def forgot_password():
@@ -290,10 +436,10 @@ def forgot_password():
     if email is None:
         return jsonify({'message': 'Missing required fields'}), 400
 
-    if not isinstance(email, str) or not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+    if not isinstance(email, str) or not validate_email(email):
         return jsonify({'message': 'Invalid email address'}), 400
 
-    user = User.query.filter_by(email=email).first()
+    user = db.session.execute(_USER_BY_EMAIL, {'email': email}).scalar_one_or_none()
 
     if user is None:
         return jsonify({'message': 'Email not found'}), 400
@@ -349,21 +495,21 @@ def reset_password():
         return jsonify({'message': 'Password must be at least 8 characters'}), 400
 
     try:
-        user_id = serializer.loads(token, salt='password-reset-salt', max_age=3600)
+        user_id = get_serializer().loads(token, salt='password-reset-salt', max_age=3600)
     except (BadSignature, SignatureExpired):
         return jsonify({'message': 'Invalid or expired token'}), 400
 
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
 
     if not user:
         return jsonify({'message': 'User not found'}), 404
 
-    user.password = bcrypt.generate_password_hash(password).decode('utf-8')
+    user.set_password(password)
     db.session.commit()
 
     return jsonify({'message': 'Password reset successfully'}), 200
 
-@auth.route('/update/<int:user_id>', methods=['PUT'])
+@auth.route('/update/<string:user_id>', methods=['PUT'])
 @jwt_required()
 def update_user(user_id):
     """
@@ -372,7 +518,7 @@ def update_user(user_id):
     parameters:
       - name: user_id
         in: path
-        type: integer
+        type: string
         required: true
         description: The user ID
       - name: body
@@ -401,10 +547,9 @@ def update_user(user_id):
       404:
         description: User not found
     """
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({'message': 'User not found'}), 404
+    # Users may only update their own account
+    if user_id != get_jwt_identity():
+        return jsonify({'message': 'Unauthorized'}), 401
 
     data = request.get_json()
 
@@ -418,15 +563,37 @@ def update_user(user_id):
     if not username or not name or not email:
         return jsonify({'message': 'Missing required fields'}), 400
 
-    user.username = username
-    user.name = name
-    user.email = email
+    # Check both unique columns against the other users in one round-trip
+    taken = db.session.execute(
+        select(User.username)
+        .where(or_(User.username == username, User.email == email))
+        .where(User.id != user_id)
+    ).first()
+    if taken is not None:
+        if taken.username == username:
+            return jsonify({'message': 'Username already taken'}), 400
+        return jsonify({'message': 'Email already registered'}), 400
+
+    # A single UPDATE; the row is never loaded into the session. The unique
+    # constraints still catch a clash that slips in after the check above
+    try:
+        updated = db.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(username=username, name=name, email=email)
+        ).rowcount
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Username or email already taken'}), 400
 
-    db.session.commit()
+    if not updated:
+        return jsonify({'message': 'User not found'}), 404
 
     return jsonify({'message': 'User updated successfully'}), 200
+
 @auth.route('/delete', methods=['POST'])
-@jwt_required
+@jwt_required()
 def delete_user():
     """
     Delete a user
@@ -441,7 +608,7 @@ def delete_user():
             - id
           properties:
             id:
-              type: integer
+              type: string
     responses:
       200:
         description: User deleted successfully
@@ -459,21 +626,14 @@ def delete_user():
 
     if not user_id:
         return jsonify({"error": "Missing required fields"}), 400
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({"error": "User not found"}), 404
 
-    if user.id != get_jwt_identity():
+    if user_id != get_jwt_identity():
         return jsonify({"error": "Unauthorized"}), 401
 
-    db.session.delete(user)
+    deleted = db.session.execute(delete(User).where(User.id == user_id)).rowcount
     db.session.commit()
 
-    return jsonify({"message": "User deleted successfully"}), 200
-
-# Register Blueprint
-app.register_blueprint(auth)
+    if not deleted:
+        return jsonify({"error": "User not found"}), 404
 
-if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    return jsonify({"message": "User deleted successfully"}), 200
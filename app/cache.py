@@ -0,0 +1,120 @@
+"""
+cache.py
+
+This module provides a Redis-backed cache for each user's calendar events.
+
+The encoded JSON body of GET /api/calendar/events is stored per user under
+a generation number. Writes bump the user's generation instead of deleting
+the body, so a request that read the old rows can only ever store its body
+under the old generation, where nothing will look for it again.
+
+Generation keys expire too, after GENERATION_TTL. Caching a body pushes
+its generation's expiry out, so a generation always outlives the bodies
+stored under it and can't restart at a number that still has one.
+
+The cache fails open: if Redis is unreachable, reads miss, writes are
+skipped and the endpoint falls back to the database.
+
+Usage:
+    generation = events_generation(user_id)
+    body = get_cached_events(user_id, generation)
+    cache_events(user_id, generation, body)
+    invalidate_events(user_id)
+"""
+import redis
+from flask import current_app
+
+EVENTS_CACHE_TTL = 300
+"""
+Seconds a cached events body is kept; bounds how long superseded
+generations linger in Redis.
+"""
+
+GENERATION_TTL = 2 * EVENTS_CACHE_TTL
+"""
+Seconds a user's generation number is kept after it was last bumped or
+had a body cached under it.
+"""
+
+_GENERATION_KEY = 'events:gen:{}'
+_EVENTS_KEY = 'events:{}:{}'
+
+
+def events_generation(user_id):
+    """
+    Returns the current cache generation for a user.
+
+    Args:
+        user_id (str): The ID of the user.
+
+    Returns:
+        int | None: The generation, or None if Redis is unavailable.
+    """
+    try:
+        return int(current_app.extensions['redis'].get(_GENERATION_KEY.format(user_id)) or 0)
+    except redis.RedisError:
+        current_app.logger.warning("Events cache unavailable", exc_info=True)
+        return None
+
+
+def get_cached_events(user_id, generation):
+    """
+    Returns the cached events body for a user's generation.
+
+    Args:
+        user_id (str): The ID of the user.
+        generation (int | None): The generation from `events_generation`.
+
+    Returns:
+        bytes | None: The JSON body, or None on a miss or if Redis is unavailable.
+    """
+    if generation is None:
+        return None
+    try:
+        return current_app.extensions['redis'].get(_EVENTS_KEY.format(user_id, generation))
+    except redis.RedisError:
+        current_app.logger.warning("Events cache unavailable", exc_info=True)
+        return None
+
+
+def cache_events(user_id, generation, body):
+    """
+    Stores a user's events body under the generation it was built for.
+
+    Args:
+        user_id (str): The ID of the user.
+        generation (int | None): The generation read before querying the events.
+        body (bytes): The JSON body to cache.
+
+    Returns:
+        None
+    """
+    if generation is None:
+        return
+    try:
+        pipe = current_app.extensions['redis'].pipeline()
+        pipe.setex(_EVENTS_KEY.format(user_id, generation), EVENTS_CACHE_TTL, body)
+        pipe.expire(_GENERATION_KEY.format(user_id), GENERATION_TTL)
+        pipe.execute()
+    except redis.RedisError:
+        current_app.logger.warning("Events cache unavailable", exc_info=True)
+
+
+def invalidate_events(user_id):
+    """
+    Moves a user to a new cache generation after their notes or to-dos change.
+
+    Args:
+        user_id (str): The ID of the user.
+
+    Returns:
+        None
+    """
+    key = _GENERATION_KEY.format(user_id)
+    try:
+        pipe = current_app.extensions['redis'].pipeline()
+        pipe.incr(key)
+        pipe.expire(key, GENERATION_TTL)
+        pipe.execute()
+    except redis.RedisError:
+        current_app.logger.warning("Failed to invalidate events cache", exc_info=True)
@@ -1,55 +1,69 @@
-from flask import Blueprint, request, jsonify
+import orjson
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from app.extensions import db
-from app.models import Note, ToDo
-from models import User
+from app.models import Note, ToDo, VALID_PRIORITIES
+from app.cache import events_generation, get_cached_events, cache_events, invalidate_events
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select, literal, func, Date
 from datetime import datetime
 
 calendar = Blueprint('calendar', __name__)
 
+# Rows fetched from the database cursor and encoded per chunk of the response
+EVENTS_BATCH_SIZE = 500
+
 @calendar.route('/events', methods=['GET'])
 @jwt_required()
 def get_events():
-    user_id = get_jwt_identity()
-    notes = Note.query.filter_by(user_id=user_id).all()
-    todos = ToDo.query.filter_by(user_id=user_id).all()
+    """
+    Returns the user's notes and todos as calendar events.
 
-    events = []
+    Both tables are read in a single UNION ALL query, selecting only the
+    columns needed to build the events. Timestamps are truncated to dates
+    by the database.
 
-    for note in notes:
-        events.append({
-            'title': note.content,
-            'start': note.created_at.strftime('%Y-%m-%d'),
-            'end': note.created_at.strftime('%Y-%m-%d'),
-            'type': 'note'
-        })
+    Rows are fetched in batches of EVENTS_BATCH_SIZE and each batch is
+    encoded and streamed as it arrives. The encoded chunks are kept and,
+    once the last one has been sent, cached per user in Redis; the body
+    is served from there until the user's notes or todos change.
+    """
+    user_id = get_jwt_identity()
+    # Read the generation before querying, so a write that lands while the
+    # events are being built leaves this body under a superseded generation
+    generation = events_generation(user_id)
+    body = get_cached_events(user_id, generation)
+    if body is not None:
+        return current_app.response_class(body, status=200, mimetype='application/json')
 
-    for todo in todos:
-        events.append({
-            'title': todo.task,
-            'start': todo.due_date.strftime('%Y-%m-%d'),
-            'end': todo.due_date.strftime('%Y-%m-%d'),
-            'type': 'todo'
-        })
+    stmt = select(
+        Note.content.label('title'),
+        func.date(Note.created_at, type_=Date).label('event_date'),
+        literal('note').label('event_type'),
+    ).where(Note.user_id == user_id).union_all(
+        select(ToDo.task, func.date(ToDo.due_date, type_=Date), literal('todo'))
+        .where(ToDo.user_id == user_id)
+    )
 
-    return jsonify(events), 200
+    def generate():
+        result = db.session.execute(stmt.execution_options(yield_per=EVENTS_BATCH_SIZE))
+        chunks = [b'[']
+        yield b'['
+        for rows in result.partitions():
+            events = []
+            for title, event_date, event_type in rows:
+                day = event_date.isoformat()
+                events.append({'title': title, 'start': day, 'end': day, 'type': event_type})
+            # Encode the batch as an array and drop its brackets to splice it in
+            chunk = (b',' if len(chunks) > 1 else b'') + orjson.dumps(events)[1:-1]
+            chunks.append(chunk)
+            yield chunk
+        chunks.append(b']')
+        yield b']'
+        cache_events(user_id, generation, b''.join(chunks))
 
-@calendar.route('/events', methods=['POST'])
-@jwt_required()
-def add_event():
-    data = request.get_json()
-    event_type = data.get('type')
-    user_id = get_jwt_identity()
-
-    if event_type == 'note':
-        new_note = Note(content=data.get('content'), user_id=user_id)
-        db.session.add(new_note)
-    elif event_type == 'todo':
-        new_todo = ToDo(task=data.get('task'), due_date=data.get('due_date'), user_id=user_id)
-        db.session.add(new_todo)
-    
-    db.session.commit()
-    return jsonify({"message": "Event added successfully"}), 201
+    return current_app.response_class(
+        stream_with_context(generate()), status=200, mimetype='application/json'
+    )
 
 @calendar.route('/events', methods=['POST'])
 @jwt_required()
@@ -61,22 +75,41 @@ def add_event():
     {
         "type": "note" or "todo",
         "content": "Event content",
-        "due_date": "2024-08-23"
+        "due_date": "2024-08-23",       (todo only)
+        "priority": "high", "medium" or "low"  (todo only)
     }
     """
     data = request.get_json()
+
+    if not data:
+        return jsonify({"message": "No input data provided"}), 400
+
     event_type = data.get('type')
+    content = data.get('content')
     user_id = get_jwt_identity()
 
+    if event_type not in ('note', 'todo'):
+        return jsonify({"message": "Invalid event type"}), 400
+
+    if not content:
+        return jsonify({"message": "Content is required"}), 400
+
     if event_type == 'note':
-        new_note = Note(content=data.get('content'), created_at=datetime.datetime.now(), user_id=user_id)
+        new_note = Note(content=content, user_id=user_id)
         db.session.add(new_note)
-    elif event_type == 'todo':
-        due_date = datetime.datetime.strptime(data.get('due_date'), '%Y-%m-%d')
-        new_todo = ToDo(task=data.get('content'), due_date=due_date, user_id=user_id)
-        db.session.add(new_todo)
     else:
-        return jsonify({"message": "Invalid event type"}), 400
+        priority = data.get('priority')
+        if not isinstance(priority, str) or priority not in VALID_PRIORITIES:
+            return jsonify({"message": "Invalid priority value"}), 400
+
+        try:
+            due_date = datetime.strptime(data.get('due_date'), '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return jsonify({"message": "Invalid due_date"}), 400
+
+        new_todo = ToDo(task=content, priority=priority, due_date=due_date, user_id=user_id)
+        db.session.add(new_todo)
 
     db.session.commit()
+    invalidate_events(user_id)
     return jsonify({"message": "Event added successfully"}), 201
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+json_provider.py
+
+This module provides an orjson-backed JSON provider for the Flask application.
+
+orjson is implemented in C and serializes straight to bytes, so `jsonify`,
+`request.get_json` and dict/list return values are encoded and decoded
+considerably faster than with the standard library `json` module.
+
+Usage:
+    app.json = OrjsonProvider(app)
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+"""
+Naive datetimes are treated as UTC (the models store datetime.utcnow()) and
+rendered with a 'Z' suffix; non-string dict keys are stringified as with json.
+"""
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson.
+
+    Types orjson can't serialize natively (e.g. Decimal) fall back to
+    DefaultJSONProvider.default.
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializes data to a JSON string.
+
+        Args:
+            obj: The data to serialize.
+
+        Returns:
+            str: The JSON document.
+        """
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserializes data from a JSON string or bytes.
+
+        Args:
+            s (str | bytes): The JSON document.
+
+        Returns:
+            The deserialized data.
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Serializes the given arguments as JSON and wraps them in a response.
+
+        The bytes produced by orjson are passed to the response as-is,
+        skipping the str round trip that `dumps` needs.
+
+        Returns:
+            Response: A response with the 'application/json' mimetype.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype,
+        )
@@ -7,6 +7,7 @@ with JWT authentication required for all actions.
 
 Routes:
     - POST /api/tasks/notes: Create a new note.
+    - POST /api/tasks/notes/bulk: Create several notes at once.
     - DELETE /api/tasks/notes/<string:note_id>: Delete a note by its ID.
     - POST /api/tasks/todos: Create a new to-do task.
     - DELETE /api/tasks/todos/<string:todo_id>: Delete a to-do task by its ID.
@@ -23,15 +24,19 @@ Dependencies:
     - app (for database session management)
 """
 from datetime import datetime
-from flask import Blueprint, request, jsonify, Flask
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Note, ToDo
-from app import db
+from sqlalchemy import insert, delete
+from app.models import Note, ToDo, VALID_PRIORITIES
+from app.extensions import db
+from app.cache import invalidate_events
 
-app = Flask(__name__)
 # Create a Blueprint for notes and to-dos
 tasks = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
+# Most notes accepted by a single bulk request
+MAX_BULK_NOTES = 500
+
 @tasks.route('/notes', methods=['POST'])
 @jwt_required()
 def create_note():
@@ -65,9 +70,58 @@ def create_note():
     note = Note(content=content, user_id=user_id)
     db.session.add(note)
     db.session.commit()
+    invalidate_events(user_id)
 
     return jsonify({"message": "Note created successfully", "note": content}), 201
 
+@tasks.route('/notes/bulk', methods=['POST'])
+@jwt_required()
+def create_notes_bulk():
+    """
+    Create several notes at once
+    ---
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          id: BulkNotes
+          required:
+            - notes
+          properties:
+            notes:
+              type: array
+              items:
+                type: string
+    responses:
+      201:
+        description: Notes created successfully
+      400:
+        description: Invalid input
+    """
+    data = request.get_json()
+    contents = data.get('notes') if isinstance(data, dict) else None
+
+    if not isinstance(contents, list) or not contents:
+        return jsonify({"error": "A non-empty list of notes is required"}), 400
+
+    if len(contents) > MAX_BULK_NOTES:
+        return jsonify({"error": f"At most {MAX_BULK_NOTES} notes per request"}), 400
+
+    if not all(isinstance(content, str) and content for content in contents):
+        return jsonify({"error": "Content is required"}), 400
+
+    # One executemany INSERT through Core; the ids come from the column default
+    user_id = get_jwt_identity()
+    db.session.execute(
+        insert(Note),
+        [{'content': content, 'user_id': user_id} for content in contents],
+    )
+    db.session.commit()
+    invalidate_events(user_id)
+
+    return jsonify({"message": "Notes created successfully", "count": len(contents)}), 201
+
 @tasks.route('/notes/<string:note_id>', methods=['DELETE'])
 @jwt_required()
 def delete_note(note_id):
@@ -86,12 +140,17 @@ def delete_note(note_id):
       404:
         description: Note not found
     """
-    note = Note.query.get(note_id)
-    if not note or note.user_id != get_jwt_identity():
+    # Ownership is part of the WHERE clause, so this is a single DELETE
+    user_id = get_jwt_identity()
+    deleted = db.session.execute(
+        delete(Note).where(Note.id == note_id, Note.user_id == user_id)
+    ).rowcount
+    db.session.commit()
+
+    if not deleted:
         return jsonify({"error": "Note not found or unauthorized"}), 404
 
-    db.session.delete(note)
-    db.session.commit()
+    invalidate_events(user_id)
 
     return jsonify({"message": "Note deleted successfully"}), 200
 
@@ -134,18 +193,24 @@ def create_todo():
     if not all([task, priority, due_date]):
         return jsonify({"error": "Missing required fields"}), 400
 
-    if priority not in ['high', 'medium', 'low']:
+    if not isinstance(priority, str) or priority not in VALID_PRIORITIES:
         return jsonify({"error": "Invalid priority value"}), 400
 
+    try:
+        due_date = datetime.fromisoformat(due_date)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid due_date"}), 400
+
     user_id = get_jwt_identity()
     todo = ToDo(
         task=task,
         priority=priority,
-        due_date=datetime.fromisoformat(due_date),
+        due_date=due_date,
         user_id=user_id
     )
     db.session.add(todo)
     db.session.commit()
+    invalidate_events(user_id)
 
     return jsonify({"message": "To-do created successfully", "todo": task}), 201
 
@@ -167,14 +232,15 @@ def delete_todo(todo_id):
       404:
         description: To-do not found
     """
-    todo = ToDo.query.get(todo_id)
-    if not todo or todo.user_id != get_jwt_identity():
+    user_id = get_jwt_identity()
+    deleted = db.session.execute(
+        delete(ToDo).where(ToDo.id == todo_id, ToDo.user_id == user_id)
+    ).rowcount
+    db.session.commit()
+
+    if not deleted:
         return jsonify({"error": "To-do not found or unauthorized"}), 404
 
-    db.session.delete(todo)
-    db.session.commit()
+    invalidate_events(user_id)
 
     return jsonify({"message": "To-do deleted successfully"}), 200
-
-# Register Blueprint
-app.register_blueprint(tasks)